@@ -1,5 +1,5 @@
-from pixi_devenv.cli import app
+from pixi_devenv.cli import run
 
 
 if __name__ == "__main__":
-    app()
+    run()
@@ -1,47 +1,85 @@
+import functools
+import sys
 from pathlib import Path
-import importlib.metadata
-from typing import Annotated
-
-from typer import Typer, Exit, Option
-import rich
-
-from pixi_devenv.error import DevEnvError
-from pixi_devenv.update import update_pixi_config
-from pixi_devenv.init import init_devenv
-
-app = Typer()
-
-
-@app.callback(invoke_without_command=True)
-def main(
-    version: Annotated[bool, Option("--version", is_eager=True)] = False,
-) -> None:
-    """Placeholder that implements --version."""
-    if version:
-        version_str = importlib.metadata.version("pixi-devenv")
-        print(f"pixi-devenv {version_str}")
-        raise Exit()
-
-
-@app.command()
-def update(path: Path | None = None) -> None:
-    """Update pixi configuration in the given directory (defaults to cwd)"""
-    updated = update_pixi_config(path or Path.cwd())
-    if updated:
-        rich.print("[green]pixi configuration updated[/green]")
-    else:
-        rich.print("pixi configuration already up to date")
-
-
-@app.command()
-def init() -> None:
-    """Initialize pixi-devenv configuration in this directory."""
-    try:
-        init_devenv(Path.cwd())
-    except DevEnvError as e:
-        rich.print(f"[red]ERROR: {e}[/red]")
-        raise Exit(code=1)
-    else:
-        rich.print(
-            "[green]pixi devenv initialized. Edit pixi.devenv.toml as needed and run 'pixi update'.[/green]"
-        )
+from typing import TYPE_CHECKING, Annotated
+
+if TYPE_CHECKING:
+    from typer import Typer
+
+
+@functools.cache
+def _version() -> str:
+    """Installed version of pixi-devenv (reading the distribution metadata is not cheap)."""
+    import importlib.metadata
+
+    return importlib.metadata.version("pixi-devenv")
+
+
+def run() -> None:
+    """
+    Console script entry point.
+
+    A lone `--version` is answered directly, without having Typer/click parse the command line.
+    """
+    if sys.argv[1:] == ["--version"]:
+        print(f"pixi-devenv {_version()}")
+        return
+    _get_app()()
+
+
+def __getattr__(name: str) -> "Typer":
+    # `app` is created on first access, so code paths that do not need the Typer application
+    # (like `run()` answering `--version`) do not pay for importing and setting it up.
+    if name == "app":
+        return _get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.cache
+def _get_app() -> "Typer":
+    from typer import Exit, Option, Typer
+
+    app = Typer()
+
+    @app.callback(invoke_without_command=True)
+    def main(
+        version: Annotated[bool, Option("--version", is_eager=True)] = False,
+    ) -> None:
+        """Placeholder that implements --version."""
+        if version:
+            print(f"pixi-devenv {_version()}")
+            raise Exit()
+
+    @app.command()
+    def update(path: Path | None = None) -> None:
+        """Update pixi configuration in the given directory (defaults to cwd)"""
+        # Imported locally so `--version`/`--help` do not pay for the consolidation machinery.
+        import rich
+
+        from pixi_devenv.update import update_pixi_config
+
+        updated = update_pixi_config(path if path is not None else Path.cwd())
+        if updated:
+            rich.print("[green]pixi configuration updated[/green]")
+        else:
+            rich.print("pixi configuration already up to date")
+
+    @app.command()
+    def init() -> None:
+        """Initialize pixi-devenv configuration in this directory."""
+        import rich
+
+        from pixi_devenv.error import DevEnvError
+        from pixi_devenv.init import init_devenv
+
+        try:
+            init_devenv(Path.cwd())
+        except DevEnvError as e:
+            rich.print(f"[red]ERROR: {e}[/red]")
+            raise Exit(code=1)
+        else:
+            rich.print(
+                "[green]pixi devenv initialized. Edit pixi.devenv.toml as needed and run 'pixi update'.[/green]"
+            )
+
+    return app
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
+import functools
 import os
 import string
-from collections import defaultdict
-from collections.abc import Iterator
-from dataclasses import dataclass
-from enum import Enum, auto
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from enum import Enum
 from pathlib import PurePath, Path
 from typing import assert_never, Sequence
 
@@ -19,8 +19,17 @@ from pixi_devenv.workspace import Workspace
 class Shell(Enum):
     """Abstracts the syntax differences for multiple shell scripts."""
 
-    Cmd = auto()
-    Bash = auto()
+    # (env-var reference prefix, env-var reference suffix, define keyword, path separator)
+    Cmd = ("%", "%", "set", ";")
+    Bash = ("${", "}", "export", ":")
+
+    def __init__(
+        self, env_var_prefix: str, env_var_suffix: str, define_keyword: str, path_separator: str
+    ) -> None:
+        self._env_var_prefix = env_var_prefix
+        self._env_var_suffix = env_var_suffix
+        self._define_keyword = define_keyword
+        self._path_separator = path_separator
 
     @classmethod
     def from_target_name(cls, target_name: str) -> Shell:
@@ -32,33 +41,25 @@ class Shell(Enum):
 
     def env_var(self, name: str) -> str:
         """Refer to an environment variable."""
-        match self:
-            case Shell.Cmd:
-                return f"%{name}%"
-            case Shell.Bash:
-                return f"${{{name}}}"
-            case unreachable:
-                assert_never(unreachable)
+        return f"{self._env_var_prefix}{name}{self._env_var_suffix}"
 
     def define_keyword(self) -> str:
         """Keyword to define an environment variable."""
-        match self:
-            case Shell.Cmd:
-                return "set"
-            case Shell.Bash:
-                return "export"
-            case unreachable:
-                assert_never(unreachable)
+        return self._define_keyword
 
     def path_separator(self) -> str:
         """Character used to separate environment variables."""
-        match self:
-            case Shell.Cmd:
-                return ";"
-            case Shell.Bash:
-                return ":"
-            case unreachable:
-                assert_never(unreachable)
+        return self._path_separator
+
+
+# Prefixes of the platforms matched by the aggregate selectors, except for "unix" which matches by exclusion.
+_SELECTOR_PLATFORM_PREFIXES = {
+    "win": ("win",),
+    "windows": ("win",),
+    "linux": ("linux",),
+    "osx": ("osx",),
+    "macos": ("osx",),
+}
 
 
 def target_matches_platforms(target_name: str, platforms: Sequence[str]) -> bool:
@@ -79,21 +80,12 @@ def target_matches_platforms(target_name: str, platforms: Sequence[str]) -> bool
         # Exact match.
         return True
 
-    for platform in platforms:
-        # Windows selectors.
-        if target_name in ("win", "windows") and platform.startswith("win"):
-            return True
-        # Linux selectors.
-        if target_name == "linux" and platform.startswith("linux"):
-            return True
-        # macOS selectors.
-        if target_name in ("osx", "macos") and platform.startswith("osx"):
-            return True
+    if target_name == "unix":
         # Unix selector (everything except Windows).
-        if target_name == "unix" and not platform.startswith("win"):
-            return True
+        return any(not platform.startswith("win") for platform in platforms)
 
-    return False
+    prefixes = _SELECTOR_PLATFORM_PREFIXES.get(target_name)
+    return prefixes is not None and any(platform.startswith(prefixes) for platform in platforms)
 
 
 def consolidate_devenv(workspace: Workspace) -> ConsolidatedProject:
@@ -101,27 +93,20 @@ def consolidate_devenv(workspace: Workspace) -> ConsolidatedProject:
     Consolidates the given workspace definition, coalescing all pixi-devenv settings from the different files
     in the workspace into a single pixi definition.
     """
-    # Resolve platforms and scalar workspace fields FIRST (downstream wins).
-    channels: tuple[str, ...] = ()
-    platforms: tuple[str, ...] = ()
-    exclude_newer: str | None = None
-
-    for project in workspace.iter_downstream():
-        if project.channels:
-            channels = project.channels
-        if project.platforms:
-            platforms = project.platforms
-        if project.exclude_newer is not None:
-            exclude_newer = project.exclude_newer
+    downstream = list(workspace.iter_downstream())
+
+    # Resolve platforms and scalar workspace fields FIRST (downstream wins): search from the most
+    # downstream project, stopping at the first one that defines each field.
+    channels = next((p.channels for p in reversed(downstream) if p.channels), ())
+    platforms = next((p.platforms for p in reversed(downstream) if p.platforms), ())
+    exclude_newer = next((p.exclude_newer for p in reversed(downstream) if p.exclude_newer is not None), None)
 
     # Consolidate root aspects.
-    root_aspect = _consolidate_aspects(
-        workspace, [(p, p.get_root_aspect()) for p in workspace.iter_downstream()]
-    )
+    root_aspect = _consolidate_aspects(workspace, [(p, p.get_root_aspect()) for p in downstream])
 
     # 3. Pass platforms to filter targets
-    consolidated_target = _consolidate_target(workspace, list(workspace.iter_downstream()), platforms)
-    consolidated_feature = _consolidate_feature(workspace, platforms)
+    consolidated_target = _consolidate_target(workspace, downstream, platforms)
+    consolidated_feature = _consolidate_feature(workspace, downstream, platforms)
 
     return ConsolidatedProject(
         name=workspace.starting_project.name,
@@ -137,7 +122,7 @@ def consolidate_devenv(workspace: Workspace) -> ConsolidatedProject:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ConsolidatedProject:
     """
     Result of consolidating all the projects in a `Workspace` in a single, final pixi.toml configuration.
@@ -162,7 +147,11 @@ class ConsolidatedProject:
 type Sources = tuple[ProjectName, ...]
 
 
-@dataclass(frozen=True)
+def _as_sources(sources: ProjectName | Sources) -> Sources:
+    return sources if isinstance(sources, tuple) else (sources,)
+
+
+@dataclass(frozen=True, slots=True)
 class MergedSpec:
     """
     Specs from different projects merged together.
@@ -194,35 +183,74 @@ class MergedSpec:
     spec: Spec
 
     def add(self, spec_name: str, sources: ProjectName | tuple[ProjectName, ...], spec: Spec) -> MergedSpec:
-        if self.spec.version != "*" and spec.version != "*":
-            version = f"{self.spec.version},{spec.version}"
-        elif self.spec.version != "*":
-            version = self.spec.version
-        else:
-            version = spec.version
+        builder = _MergedSpecBuilder.from_merged_spec(self)
+        builder.add(spec_name, sources, spec)
+        return builder.build_merged_spec()
+
+
+@dataclass(slots=True)
+class _MergedSpecBuilder:
+    """
+    Mutable counterpart of `MergedSpec`.
+
+    Used while consolidating so that merging many specs with the same name appends to `sources` in place,
+    instead of creating a new tuple (and a new `MergedSpec`) for every merge.
+    """
 
-        if self.spec.build and spec.build and self.spec.build != spec.build:
+    sources: list[ProjectName]
+    # Versions to be joined together; "*" does not add anything to the version, so it is left out
+    # ("*,>=1.0" is collapsed to ">=1.0").
+    versions: list[str]
+    build: str
+    channel: str
+
+    @classmethod
+    def from_spec(cls, source: ProjectName, spec: Spec) -> _MergedSpecBuilder:
+        return cls([source], _versions_list(spec.version), spec.build, spec.channel)
+
+    @classmethod
+    def from_merged_spec(cls, merged_spec: MergedSpec) -> _MergedSpecBuilder:
+        spec = merged_spec.spec
+        return cls(list(merged_spec.sources), _versions_list(spec.version), spec.build, spec.channel)
+
+    def add(self, spec_name: str, sources: ProjectName | tuple[ProjectName, ...], spec: Spec) -> None:
+        if self.build and spec.build and self.build != spec.build:
             raise DevEnvError(
-                f"Conflicting builds declared for {spec_name} in {self.sources} and {sources}: {self.spec.build}, {spec.build}"
+                f"Conflicting builds declared for {spec_name} in {tuple(self.sources)} and {sources}: {self.build}, {spec.build}"
             )
-        build = self.spec.build or spec.build
 
-        if not isinstance(sources, tuple):
-            sources = (sources,)
-
-        if self.spec.channel and spec.channel and self.spec.channel != spec.channel:
+        if self.channel and spec.channel and self.channel != spec.channel:
             raise DevEnvError(
-                f"Conflicting channels declared for {spec_name} in {self.sources} and {sources}: {self.spec.channel}, {spec.channel}"
+                f"Conflicting channels declared for {spec_name} in {tuple(self.sources)} and {_as_sources(sources)}: {self.channel}, {spec.channel}"
             )
-        channel = self.spec.channel or spec.channel
 
+        if spec.version != "*":
+            self.versions.append(spec.version)
+
+        # Most merges come from a single project: append it directly instead of wrapping it in a tuple.
+        if isinstance(sources, tuple):
+            self.sources.extend(sources)
+        else:
+            self.sources.append(sources)
+        self.build = self.build or spec.build
+        self.channel = self.channel or spec.channel
+
+    def build_merged_spec(self) -> MergedSpec:
         return MergedSpec(
-            sources=self.sources + sources,
-            spec=Spec(version=version, build=build, channel=channel),
+            sources=tuple(self.sources),
+            spec=Spec(
+                version=",".join(self.versions) if self.versions else "*",
+                build=self.build,
+                channel=self.channel,
+            ),
         )
 
 
-@dataclass(frozen=True)
+def _versions_list(version: str) -> list[str]:
+    return [] if version == "*" else [version]
+
+
+@dataclass(frozen=True, slots=True)
 class ResolvedEnvVar:
     """
     An environment variable where the pixi-devenv placeholders have been resolved.
@@ -241,13 +269,19 @@ class ResolvedEnvVar:
 
     @classmethod
     def resolve(cls, project: Project, ws: Workspace, value: EnvVarValue) -> ResolvedEnvVar:
-        relative = project.directory.relative_to(ws.starting_project.directory)
-        normalized = Path(os.path.normpath(relative))
-        mapping = {
-            "devenv_project_dir": PurePath("${PIXI_PROJECT_ROOT}", normalized).as_posix(),
-        }
+        mapping = _placeholders_mapping(project.directory, ws.starting_project.directory)
 
         def replace_devenv_vars(s: str) -> str:
+            if not _needs_jinja(s):
+                # Most values do not use placeholders at all, Jinja would return them unchanged.
+                return s
+            # Plain replacement handles the documented spelling of the placeholders (`${{ name }}`);
+            # values using anything else Jinja would process are rendered as a whole by Jinja.
+            replaced = s
+            for name, placeholder_value in mapping.items():
+                replaced = replaced.replace(f"${{{{ {name} }}}}", placeholder_value)
+            if not _needs_jinja(replaced):
+                return replaced
             t = jinja2.Template(s, variable_start_string="${{", variable_end_string="}}")
             return t.render(**mapping)
 
@@ -260,7 +294,29 @@ class ResolvedEnvVar:
                 assert_never(unreachable)
 
 
-@dataclass(frozen=True)
+def _needs_jinja(s: str) -> bool:
+    """
+    If rendering the given value with Jinja could change it: placeholders, statements or comments, or
+    newlines (Jinja normalizes them and strips a trailing newline).
+    """
+    return any(marker in s for marker in ("${{", "{%", "{#", "\n", "\r"))
+
+
+@functools.cache
+def _placeholders_mapping(project_directory: Path, starting_directory: Path) -> Mapping[str, str]:
+    """
+    Values for the placeholders of env-vars defined in the project at `project_directory`.
+
+    Cached because it is the same for every env-var of the project, while computing it involves path manipulations.
+    """
+    relative = project_directory.relative_to(starting_directory)
+    normalized = Path(os.path.normpath(relative))
+    return {
+        "devenv_project_dir": PurePath("${PIXI_PROJECT_ROOT}", normalized).as_posix(),
+    }
+
+
+@dataclass(frozen=True, slots=True)
 class MergedEnvVarValue:
     """
     Environment variables from different projects merged together.
@@ -274,31 +330,46 @@ class MergedEnvVarValue:
     sources: Sources
     var: ResolvedEnvVar
 
+    # Type tag of `var.value`, computed once so merging does not need to inspect both values.
+    _is_tuple: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_is_tuple", isinstance(self.var.value, tuple))
+
     def merge(self, other: MergedEnvVarValue) -> MergedEnvVarValue:
-        sources = self.sources + other.sources
-        match other.var.value:
-            case str():
-                if not isinstance(self.var.value, str):
-                    raise DevEnvError(
-                        f"Incompatible env-var definition, they should have the same type: {other.var.value!r} vs {self.var.value!r}"
-                    )
-                return MergedEnvVarValue(sources=sources, var=other.var)
-            case tuple():
-                if not isinstance(self.var.value, tuple):
-                    raise DevEnvError(
-                        f"Incompatible env-var definition, they should have the same type: {other.var.value!r} vs {self.var.value!r}"
-                    )
-                new_values = ResolvedEnvVar(self.var.value + other.var.value)
-                return MergedEnvVarValue(sources=sources, var=new_values)
-            case unreachable:
-                assert_never(unreachable)
+        return MergedEnvVarValue.merge_all([self, other])
+
+    @classmethod
+    def merge_all(cls, values: Sequence[MergedEnvVarValue]) -> MergedEnvVarValue:
+        """
+        Merges all the given values, from upstream to downstream.
+
+        Same as calling `merge` successively, but the sources and values are built only once.
+        """
+        first = values[0]
+        if len(values) == 1:
+            # Defined by a single project (the common case): nothing to merge.
+            return first
+        for i, other in enumerate(values[1:], start=1):
+            if other._is_tuple != first._is_tuple:
+                # Report the value merged so far, the one `merge` would be comparing against.
+                merged = cls.merge_all(values[:i]) if i > 1 else first
+                raise DevEnvError(
+                    f"Incompatible env-var definition, they should have the same type: {other.var.value!r} vs {merged.var.value!r}"
+                )
+        sources = tuple(source for value in values for source in value.sources)
+        if first._is_tuple:
+            return cls(
+                sources=sources, var=ResolvedEnvVar(tuple(x for value in values for x in value.var.value))
+            )
+        else:
+            return cls(sources=sources, var=values[-1].var)
 
     def get_generic_value(self) -> str | None:
         match self.var.value:
             case str(v):
-                t = string.Template(v)
                 # Without any identifiers: does not require platform-specific replacements, so it is generic.
-                if not t.get_identifiers():
+                if not _has_template_identifiers(v):
                     return v
                 else:
                     # Requires platform-specific replacement of the variables:
@@ -312,7 +383,17 @@ class MergedEnvVarValue:
                 assert_never(unreachable)
 
 
-@dataclass
+def _has_template_identifiers(value: str) -> bool:
+    """
+    Same as `bool(string.Template(value).get_identifiers())`, scanning with the compiled pattern
+    directly instead of creating a template and the list of identifiers.
+    """
+    if "$" not in value:
+        return False
+    return any(m.group("named") or m.group("braced") for m in string.Template.pattern.finditer(value))
+
+
+@dataclass(slots=True)
 class ConsolidatedAspect:
     """
     Result of consolidating many aspects into a single aspect, merging the configurations.
@@ -324,7 +405,7 @@ class ConsolidatedAspect:
     env_vars: dict[str, MergedEnvVarValue]
 
 
-@dataclass
+@dataclass(slots=True)
 class ConsolidatedFeature:
     """
     Result of consolidating many features into a single feature, merging the configurations.
@@ -346,135 +427,135 @@ class ConsolidatedFeature:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FeatureWithProject:
     """Utility that tracks a project together with a feature."""
 
     project: Project
     feature: Feature
 
+    @property
+    def name(self) -> ProjectName:
+        return self.project.name
+
     @property
     def target(self) -> dict[str, Aspect]:
         return self.feature.target
 
 
-def get_project_name(p: Project | FeatureWithProject) -> ProjectName:
-    match p:
-        case Project():
-            return p.name
-        case FeatureWithProject(project=project):
-            return project.name
-        case unreachable:
-            assert_never(unreachable)
+@dataclass(frozen=True, slots=True)
+class _InheritedAspects:
+    """Which aspects of a project are inherited by the starting project."""
+
+    project_name: ProjectName
+    use_dependencies: bool
+    use_pypi_dependencies: bool
+    use_env_vars: bool
+
+    @classmethod
+    def evaluate(cls, name: ProjectName, starting_project: Project) -> _InheritedAspects:
+        if name == starting_project.name:
+            # The starting project always uses all its own aspects, no need to evaluate each one.
+            return cls(
+                project_name=name, use_dependencies=True, use_pypi_dependencies=True, use_env_vars=True
+            )
+        inherit = starting_project.inherit
+        return cls(
+            project_name=name,
+            use_dependencies=inherit.use_dependencies(name, starting_project),
+            use_pypi_dependencies=inherit.use_pypi_dependencies(name, starting_project),
+            use_env_vars=inherit.use_env_vars(name, starting_project),
+        )
+
+    def inherits_any(self) -> bool:
+        return self.use_dependencies or self.use_pypi_dependencies or self.use_env_vars
+
+
+def _update_specs(
+    project_name: ProjectName,
+    dependencies_dict: dict[str, _MergedSpecBuilder],
+    specs: Mapping[str, Spec],
+) -> None:
+    for name, spec in specs.items():
+        if (builder := dependencies_dict.get(name)) is None:
+            # Add new dependency.
+            dependencies_dict[name] = _MergedSpecBuilder.from_spec(project_name, spec)
+        else:
+            # Merge with existing dependency.
+            builder.add(name, project_name, spec)
 
 
 def _consolidate_aspects(
     workspace: Workspace,
     aspects: Sequence[tuple[Project | FeatureWithProject, Aspect]],
 ) -> ConsolidatedAspect:
-    def update_specs(
-        project_name: ProjectName,
-        dependencies_dict: dict[str, MergedSpec],
-        specs: Iterator[tuple[str, Spec]],
-    ) -> None:
-        for name, spec in specs:
-            try:
-                merged_spec = dependencies_dict[name]
-            except KeyError:
-                # Add new dependency.
-                dependencies_dict[name] = MergedSpec((project_name,), spec)
-            else:
-                # Merge with existing dependency.
-                dependencies_dict[name] = merged_spec.add(name, project_name, spec)
-
-    constraints: dict[str, MergedSpec] = {}
-
     starting_project = workspace.starting_project
-    inherit = starting_project.inherit
-
-    for project_or_feature, aspect in aspects:
-        project_name = get_project_name(project_or_feature)
-        inherit_this_constraints = inherit.use_dependencies(
-            project_name, starting_project
-        ) or inherit.use_pypi_dependencies(project_name, starting_project)
-        if inherit_this_constraints:
-            update_specs(
-                project_name, constraints, ((n, Spec.normalized(s)) for (n, s) in aspect.constraints.items())
-            )
 
-    dependencies: dict[str, MergedSpec] = {}
-    pypi_dependencies: dict[str, MergedSpec] = {}
+    constraints: dict[str, _MergedSpecBuilder] = {}
+    dependencies: dict[str, _MergedSpecBuilder] = {}
+    pypi_dependencies: dict[str, _MergedSpecBuilder] = {}
+    # Values are collected first and merged once per name, avoiding re-creating the merged sources/values each time.
+    env_vars_to_merge: dict[str, list[MergedEnvVarValue]] = {}
 
+    # Single pass over the aspects: constraints are passed through unchanged, so the different
+    # kinds of aspects can be consolidated independently of each other.
     for project_or_feature, aspect in aspects:
-        project_name = get_project_name(project_or_feature)
-        if inherit.use_dependencies(project_name, starting_project):
-            update_specs(
-                project_name,
-                dependencies,
-                ((n, Spec.normalized(s)) for (n, s) in aspect.dependencies.items()),
-            )
-        if inherit.use_pypi_dependencies(project_name, starting_project):
-            update_specs(
-                project_name,
-                pypi_dependencies,
-                ((n, Spec.normalized(s)) for (n, s) in aspect.pypi_dependencies.items()),
-            )
-
-    result_env_vars: dict[str, MergedEnvVarValue] = {}
-
-    for project_or_feature, aspect in aspects:
-        project_name = get_project_name(project_or_feature)
-        if not inherit.use_env_vars(project_name, starting_project):
+        inherited = _InheritedAspects.evaluate(project_or_feature.name, starting_project)
+        if not inherited.inherits_any():
             continue
 
-        match project_or_feature:
-            case Project():
-                project = project_or_feature
-            case FeatureWithProject(project=p):
-                project = p
-            case unreachable:
-                assert_never(unreachable)
-
-        for name, env_var in aspect.env_vars.items():
-            evaluated_env_var = ResolvedEnvVar.resolve(project, workspace, env_var)
-            merged = MergedEnvVarValue(sources=(project_name,), var=evaluated_env_var)
-            try:
-                evaluated = result_env_vars[name]
-                result_env_vars[name] = evaluated.merge(merged)
-            except KeyError:
-                result_env_vars[name] = merged
+        if inherited.use_dependencies or inherited.use_pypi_dependencies:
+            _update_specs(inherited.project_name, constraints, aspect.constraints)
+        if inherited.use_dependencies:
+            _update_specs(inherited.project_name, dependencies, aspect.dependencies)
+        if inherited.use_pypi_dependencies:
+            _update_specs(inherited.project_name, pypi_dependencies, aspect.pypi_dependencies)
+
+        if inherited.use_env_vars:
+            match project_or_feature:
+                case Project() as p:
+                    project = p
+                case FeatureWithProject(project=p):
+                    project = p
+                case unreachable:
+                    assert_never(unreachable)
+
+            for name, env_var in aspect.env_vars.items():
+                evaluated_env_var = ResolvedEnvVar.resolve(project, workspace, env_var)
+                env_vars_to_merge.setdefault(name, []).append(
+                    MergedEnvVarValue(sources=(inherited.project_name,), var=evaluated_env_var)
+                )
 
     return ConsolidatedAspect(
-        dependencies=dependencies,
-        pypi_dependencies=pypi_dependencies,
-        constraints=constraints,
-        env_vars=result_env_vars,
+        dependencies={n: b.build_merged_spec() for n, b in dependencies.items()},
+        pypi_dependencies={n: b.build_merged_spec() for n, b in pypi_dependencies.items()},
+        constraints={n: b.build_merged_spec() for n, b in constraints.items()},
+        env_vars={n: MergedEnvVarValue.merge_all(values) for n, values in env_vars_to_merge.items()},
     )
 
 
 def _consolidate_target(
     workspace: Workspace, projects: Sequence[Project | FeatureWithProject], platforms: Sequence[str] = ()
 ) -> dict[str, ConsolidatedAspect]:
-    all_targets = defaultdict[str, list[Project | FeatureWithProject]](list)
+    all_targets: dict[str, list[tuple[Project | FeatureWithProject, Aspect]]] = {}
     for project in projects:
-        for target_name in project.target:
+        for target_name, target_aspect in project.target.items():
             if target_matches_platforms(target_name, platforms):
-                all_targets[target_name].append(project)
+                all_targets.setdefault(target_name, []).append((project, target_aspect))
 
     consolidated_aspect = dict[str, ConsolidatedAspect]()
-    for target_name, projects in all_targets.items():
-        aspect = _consolidate_aspects(workspace, [(p, p.target[target_name]) for p in projects])
-        consolidated_aspect[target_name] = aspect
+    for target_name, aspects in all_targets.items():
+        consolidated_aspect[target_name] = _consolidate_aspects(workspace, aspects)
     return consolidated_aspect
 
 
 def _consolidate_feature(
-    workspace: Workspace, platforms: Sequence[str] = ()
+    workspace: Workspace, downstream: Sequence[Project], platforms: Sequence[str] = ()
 ) -> dict[str, ConsolidatedFeature]:
-    all_features = defaultdict[str, list[Project]](list)
-    for project in workspace.iter_downstream():
+    all_features: dict[str, list[Project]] = {}
+    for project in downstream:
         for feature_name in project.feature:
-            all_features[feature_name].append(project)
+            all_features.setdefault(feature_name, []).append(project)
 
     starting_project = workspace.starting_project
     inherit = starting_project.inherit
@@ -489,6 +570,10 @@ def _consolidate_feature(
                 aspects_and_projects.append((project, project.feature[feature_name].get_aspect()))
                 features_with_projects.append(FeatureWithProject(project, project.feature[feature_name]))
 
+        if not features_with_projects:
+            # Feature not inherited from any project.
+            continue
+
         aspect = _consolidate_aspects(workspace, aspects_and_projects)
         target = _consolidate_target(workspace, features_with_projects, platforms)
 
@@ -1,25 +1,28 @@
 from __future__ import annotations
 
+import functools
+import sys
 from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Union, Any, NewType, assert_never
 
-import serde.toml
+import rtoml
+import serde
 
 from pixi_devenv.error import DevEnvError
 
 ProjectName = NewType("ProjectName", str)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Root:
     """Schema for the root definition in a pixi.devenv.toml file: [devenv]."""
 
     devenv: Project
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Upstream:
     """Schema for an entries in `[devenv.upstream]`.
 
@@ -38,18 +41,24 @@ class Upstream:
 
     path: str
 
-    @classmethod
-    def normalized(cls, upstream: str | Upstream) -> Upstream:
-        match upstream:
-            case str() as path:
-                return Upstream(path)
-            case Upstream():
-                return upstream
-            case unreachable:
-                assert_never(unreachable)
-
 
-@dataclass
+def _deserialize_upstreams(data: list[Any]) -> tuple[Upstream, ...]:
+    """
+    Deserializes the `[devenv.upstream]` entries, normalizing the direct string form to `Upstream` at load time,
+    same as `_deserialize_specs`.
+    """
+    result = []
+    for upstream in data:
+        if isinstance(upstream, str):
+            result.append(Upstream(upstream))
+        elif isinstance(upstream, dict):
+            result.append(serde.from_dict(Upstream, upstream))
+        else:
+            raise serde.SerdeError(f"Invalid upstream, expected a string or a table: {upstream!r}")
+    return tuple(result)
+
+
+@dataclass(frozen=True, slots=True)
 class Spec:
     """
     Schema for a package spec definition.
@@ -69,20 +78,35 @@ class Spec:
     build: str = ""
     channel: str = ""
 
-    @classmethod
-    def normalized(cls, spec: Spec | str) -> Spec:
-        match spec:
-            case str() as version:
-                return Spec(version=version)
-            case Spec():
-                return spec
-            case unreachable:
-                assert_never(unreachable)
-
     def is_version_only(self) -> bool:
         return not self.build and not self.channel
 
 
+@functools.cache
+def _get_version_spec(version: str) -> Spec:
+    """Spec for the direct string form, shared because the same versions (like "*") repeat across projects."""
+    return Spec(version=version)
+
+
+def _deserialize_specs(data: dict[str, Any]) -> dict[str, Spec]:
+    """
+    Deserializes a table of specs (like `[devenv.dependencies]`), normalizing the direct string form to `Spec`
+    at load time so the rest of the code only needs to deal with `Spec` objects.
+    """
+    result = {}
+    for name, spec in data.items():
+        # Interned like project names: the same package names repeat across projects and are used as keys
+        # when consolidating.
+        name = sys.intern(name)
+        if isinstance(spec, str):
+            result[name] = _get_version_spec(spec)
+        elif isinstance(spec, dict):
+            result[name] = serde.from_dict(Spec, spec)
+        else:
+            raise serde.SerdeError(f"Invalid spec for {name!r}, expected a string or a table: {spec!r}")
+    return result
+
+
 # Type for the value of an environment variable.
 # It can be either:
 # A single string, in which case the environment variable is set to that value.
@@ -92,7 +116,7 @@ EnvVarValue = Union[str, tuple[str, ...]]
 
 
 @serde.serde(tagging=serde.Untagged)
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Aspect:
     """
     Holds a set of dependencies, constraints and environment variables.
@@ -101,21 +125,24 @@ class Aspect:
     """
 
     # Direct conda dependencies.
-    dependencies: dict[str, Spec | str] = serde.field(default_factory=dict)
+    dependencies: dict[str, Spec] = serde.field(default_factory=dict, deserializer=_deserialize_specs)
 
     # Direct PyPI dependencies.
-    pypi_dependencies: dict[str, Spec | str] = serde.field(rename="pypi-dependencies", default_factory=dict)
+    pypi_dependencies: dict[str, Spec] = serde.field(
+        rename="pypi-dependencies", default_factory=dict, deserializer=_deserialize_specs
+    )
 
     # Constraints.
     # Constraints define a version restriction on downstream packages that explicitly depend on the constraint, but
     # the constrained package is not directly added as a dependency.
-    constraints: dict[str, Spec | str] = serde.field(default_factory=dict)
+    constraints: dict[str, Spec] = serde.field(default_factory=dict, deserializer=_deserialize_specs)
 
     # Environment variables.
     env_vars: dict[str, EnvVarValue] = serde.field(rename="env-vars", default_factory=dict)
 
 
 @serde.serde(tagging=serde.Untagged)
+@dataclass(frozen=True, slots=True)
 class Feature:
     """
     Defines a feature in pixi.devenv.toml file.
@@ -125,13 +152,15 @@ class Feature:
     """
 
     # Same as `Aspect.dependencies`.
-    dependencies: dict[str, Spec | str] = serde.field(default_factory=dict)
+    dependencies: dict[str, Spec] = serde.field(default_factory=dict, deserializer=_deserialize_specs)
 
     # Same as `Aspect.pypi_dependencies`.
-    pypi_dependencies: dict[str, Spec | str] = serde.field(rename="pypi-dependencies", default_factory=dict)
+    pypi_dependencies: dict[str, Spec] = serde.field(
+        rename="pypi-dependencies", default_factory=dict, deserializer=_deserialize_specs
+    )
 
     # Same as `Aspect.constraints`.
-    constraints: dict[str, Spec | str] = serde.field(default_factory=dict)
+    constraints: dict[str, Spec] = serde.field(default_factory=dict, deserializer=_deserialize_specs)
 
     # Same as `Aspect.env_vars`.
     env_vars: dict[str, EnvVarValue] = serde.field(rename="env-vars", default_factory=dict)
@@ -149,6 +178,7 @@ class Feature:
 
 
 @serde.serde(tagging=serde.Untagged)
+@dataclass(frozen=True, slots=True)
 class Include:
     """
     Schema for an item in an Inheritance section that should be included when consolidating.
@@ -159,8 +189,17 @@ class Include:
 
     include: tuple[ProjectName, ...]
 
+    # Same names as `include`, for fast membership tests.
+    include_set: frozenset[ProjectName] = serde.field(skip=True, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Interned like project names (see `Project.from_file`), so membership tests compare by identity.
+        object.__setattr__(self, "include", tuple(ProjectName(sys.intern(x)) for x in self.include))
+        object.__setattr__(self, "include_set", frozenset(self.include))
+
 
 @serde.serde(tagging=serde.Untagged)
+@dataclass(frozen=True, slots=True)
 class Exclude:
     """
     Schema for an item in an Inheritance section that should be excluded when consolidating.
@@ -171,9 +210,17 @@ class Exclude:
 
     exclude: tuple[ProjectName, ...]
 
+    # Same names as `exclude`, for fast membership tests.
+    exclude_set: frozenset[ProjectName] = serde.field(skip=True, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Interned like project names (see `Project.from_file`), so membership tests compare by identity.
+        object.__setattr__(self, "exclude", tuple(ProjectName(sys.intern(x)) for x in self.exclude))
+        object.__setattr__(self, "exclude_set", frozenset(self.exclude))
+
 
 @serde.serde(tagging=serde.Untagged)
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Inheritance:
     """
     Controls how we inherit different aspects from upstream projects.
@@ -222,15 +269,14 @@ class Inheritance:
     ) -> bool:
         if name == starting_project.name:
             return True
-        match include_exclude:
-            case Include(include):
-                return name in include
-            case Exclude(exclude):
-                return name not in exclude
-            case bool() as include:
-                return include
-            case unreachable:
-                assert_never(unreachable)
+        if isinstance(include_exclude, bool):
+            return include_exclude
+        elif isinstance(include_exclude, Include):
+            return name in include_exclude.include_set
+        elif isinstance(include_exclude, Exclude):
+            return name not in include_exclude.exclude_set
+        else:
+            assert_never(include_exclude)
 
 
 @serde.serde(tagging=serde.Untagged)
@@ -263,16 +309,18 @@ class Project:
     exclude_newer: str | None = serde.field(rename="exclude-newer", default=None)
 
     # List of upstream projects.
-    upstream: tuple[str | Upstream, ...] = ()
+    upstream: tuple[Upstream, ...] = serde.field(default=(), deserializer=_deserialize_upstreams)
 
     # Same as `Aspect.dependencies`.
-    dependencies: dict[str, Spec | str] = serde.field(default_factory=dict)
+    dependencies: dict[str, Spec] = serde.field(default_factory=dict, deserializer=_deserialize_specs)
 
     # Same as `Aspect.pypi_dependencies`.
-    pypi_dependencies: dict[str, Spec | str] = serde.field(rename="pypi-dependencies", default_factory=dict)
+    pypi_dependencies: dict[str, Spec] = serde.field(
+        rename="pypi-dependencies", default_factory=dict, deserializer=_deserialize_specs
+    )
 
     # Same as `Aspect.constraints`.
-    constraints: dict[str, Spec | str] = serde.field(default_factory=dict)
+    constraints: dict[str, Spec] = serde.field(default_factory=dict, deserializer=_deserialize_specs)
 
     # Same as `Aspect.env_vars`.
     env_vars: dict[str, EnvVarValue] = serde.field(rename="env-vars", default_factory=dict)
@@ -299,7 +347,16 @@ class Project:
 
     @classmethod
     def from_file(cls, devenv_file: Path) -> Project:
-        root = serde.toml.from_toml(Root, devenv_file.read_text(encoding="UTF-8"))
+        """
+        Loads the project defined by the given pixi.devenv.toml file.
+        """
+        # read_bytes skips the TextIOWrapper machinery of read_text; its newline translation is done by hand,
+        # as rtoml keeps "\r\n" inside multi-line strings.
+        contents = devenv_file.read_bytes().decode("UTF-8")
+        if "\r" in contents:
+            contents = contents.replace("\r\n", "\n").replace("\r", "\n")
+        # rtoml (native) is considerably faster than the pure Python tomllib, and parsing dominates loading.
+        root: Root = serde.from_dict(Root, rtoml.loads(contents))
         if root.devenv._name is not None:
             raise DevEnvError(
                 f"In file {devenv_file}:\ndevenv.name should not be defined explicitly, it is derived from the directory name."
@@ -309,11 +366,12 @@ class Project:
                 f"In file {devenv_file}:\ndevenv.environments table should not be defined in pixi.devenv.toml, define directly in pixi.toml."
             )
         root.devenv.filename = devenv_file.absolute()
-        root.devenv._name = ProjectName(devenv_file.parent.name)
+        # Names are repeated in the `sources` of every merged spec/env-var: interning makes comparisons cheap.
+        root.devenv._name = ProjectName(sys.intern(devenv_file.parent.name))
         return root.devenv
 
     def iter_upstream(self) -> Iterator[Upstream]:
-        yield from (Upstream.normalized(x) for x in self.upstream)
+        yield from self.upstream
 
     def get_root_aspect(self) -> Aspect:
         return Aspect(
@@ -1,4 +1,5 @@
 import dataclasses
+import functools
 import string
 from collections.abc import Mapping, Sequence
 from pathlib import Path
@@ -56,12 +57,11 @@ def _update_pixi_contents(contents: str, consolidated: ConsolidatedProject) -> s
     for name, table in tables.items():
         doc[name] = table
 
-    features_table = _make_table()
-    for feature_name, feature in consolidated.feature.items():
-        tables = _get_project_or_feature_tables(feature, consolidated.platforms)
-        features_table[feature_name] = tables
-
-    if features_table:
+    if consolidated.feature:
+        features_table = _make_table()
+        for feature_name, feature in consolidated.feature.items():
+            tables = _get_project_or_feature_tables(feature, consolidated.platforms)
+            features_table[feature_name] = tables
         doc["feature"] = features_table
 
     new_contents = tomlkit.dumps(doc)
@@ -72,18 +72,20 @@ _MANAGED_COMMENT = "Managed by devenv"
 
 
 def _update_workspace_fields(doc: tomlkit.TOMLDocument, consolidated: ConsolidatedProject) -> None:
-    doc["workspace"]["name"] = consolidated.name  # type:ignore[index]
-    doc["workspace"]["name"].comment(_MANAGED_COMMENT)  # type:ignore[index, union-attr]
-
-    doc["workspace"]["channels"] = consolidated.channels  # type:ignore[index]
-    doc["workspace"]["channels"].comment(_MANAGED_COMMENT)  # type:ignore[index, union-attr]
-
-    doc["workspace"]["platforms"] = consolidated.platforms  # type:ignore[index]
-    doc["workspace"]["platforms"].comment(_MANAGED_COMMENT)  # type:ignore[index, union-attr]
-
+    fields: dict[str, str | Sequence[str]] = {
+        "name": consolidated.name,
+        "channels": consolidated.channels,
+        "platforms": consolidated.platforms,
+    }
     if consolidated.exclude_newer is not None:
-        doc["workspace"]["exclude-newer"] = consolidated.exclude_newer  # type:ignore[index]
-        doc["workspace"]["exclude-newer"].comment(_MANAGED_COMMENT)  # type:ignore[index, union-attr]
+        fields["exclude-newer"] = consolidated.exclude_newer
+
+    workspace = doc["workspace"]
+    for key, value in fields.items():
+        # Comment the items before adding them, so the workspace table is changed only once per field.
+        item = tomlkit.item(value)
+        item.comment(_MANAGED_COMMENT)
+        workspace[key] = item  # type:ignore[index]
 
 
 def _get_project_or_feature_tables(
@@ -114,9 +116,6 @@ def _get_project_or_feature_tables(
         activation_table["env"] = env_table
         result["activation"] = activation_table
 
-    target_table = tomlkit.table()
-    target_table.comment(_MANAGED_COMMENT)
-
     platform_specific_by_target = {}
 
     if grouped_env_vars.platform_specific:
@@ -125,38 +124,32 @@ def _get_project_or_feature_tables(
         if target_matches_platforms("win", platforms):
             platform_specific_by_target["win"] = grouped_env_vars.platform_specific
 
-    if consolidated.target or grouped_env_vars.platform_specific:
-        for target_name, aspect in consolidated.target.items():
-            current_target_table = _make_table()
-            target_table[target_name] = current_target_table
+    # Targets from the project/feature, followed by targets which only have platform-specific env-vars.
+    target_table: Table | None = None
+    for target_name in dict.fromkeys([*consolidated.target, *platform_specific_by_target]):
+        if target_table is None:
+            target_table = result["target"] = _make_table()
+        current_target_table = _make_table()
+        target_table[target_name] = current_target_table
 
+        env_vars: Mapping[str, MergedEnvVarValue] = {}
+        if (aspect := consolidated.target.get(target_name)) is not None:
             if table := _create_dependencies_table(aspect.dependencies):
                 current_target_table["dependencies"] = table
             if table := _create_dependencies_table(aspect.pypi_dependencies):
                 current_target_table["pypi-dependencies"] = table
             if table := _create_dependencies_table(aspect.constraints):
                 current_target_table["constraints"] = table
+            env_vars = aspect.env_vars
 
-            env_vars = dict(aspect.env_vars)
-            if (existing_section := platform_specific_by_target.pop(target_name, None)) is not None:
-                env_vars = dict(_merge_env_vars(env_vars, existing_section))
-
-            if env_vars:
-                env_table = _make_table()
-                env_table["env"] = _render_env_vars(target_name, env_vars)
-                current_target_table["activation"] = env_table
-
-        for target_name, env_vars in platform_specific_by_target.items():
-            current_target_table = _make_table()
-            target_table[target_name] = current_target_table
+        if (platform_specific := platform_specific_by_target.get(target_name)) is not None:
+            env_vars = _merge_env_vars(env_vars, platform_specific)
 
+        if env_vars:
             env_table = _make_table()
             env_table["env"] = _render_env_vars(target_name, env_vars)
             current_target_table["activation"] = env_table
 
-    if target_table:
-        result["target"] = target_table
-
     return result
 
 
@@ -175,22 +168,19 @@ class GroupedEnvironmentVariables:
 def _merge_env_vars(
     b: Mapping[str, MergedEnvVarValue], a: Mapping[str, MergedEnvVarValue]
 ) -> Mapping[str, MergedEnvVarValue]:
-    result = dict(b.items())
-
-    for name in set(a).intersection(b):
-        result[name] = a[name].merge(b[name])
-
-    for name in a.keys() - b.keys():
-        result[name] = a[name]
+    result = dict(b)
+    for name, value in a.items():
+        existing = result.get(name)
+        result[name] = value.merge(existing) if existing is not None else value
     return result
 
 
 def _render_env_vars(target_name: str, env_vars: Mapping[str, MergedEnvVarValue]) -> Table:
     def substitute(value: str) -> str:
-        template = string.Template(value)
-        replacements = template.get_identifiers()
-        mapping = {x: shell.env_var(x) for x in replacements}
-        return template.safe_substitute(mapping)
+        if "$" not in value:
+            return value
+        mapping = {x: shell.env_var(x) for x in _get_template_identifiers(value)}
+        return string.Template(value).safe_substitute(mapping)
 
     shell = Shell.from_target_name(target_name)
     rendered_vars: dict[str, str] = {}
@@ -209,6 +199,12 @@ def _render_env_vars(target_name: str, env_vars: Mapping[str, MergedEnvVarValue]
     return result
 
 
+@functools.cache
+def _get_template_identifiers(value: str) -> tuple[str, ...]:
+    """Identifiers of the variables referenced in the given value (cached, the same values repeat across targets)."""
+    return tuple(string.Template(value).get_identifiers())
+
+
 def _split_env_vars(vars: Mapping[str, MergedEnvVarValue]) -> GroupedEnvironmentVariables:
     generic = {}
     platform_specific = {}
@@ -221,9 +217,10 @@ def _split_env_vars(vars: Mapping[str, MergedEnvVarValue]) -> GroupedEnvironment
 
 
 def _create_dependencies_table(deps: Mapping[str, MergedSpec]) -> Table | None:
-    result = tomlkit.table()
-    result.comment(_MANAGED_COMMENT)
+    if not deps:
+        return None
 
+    result = _make_table()
     for name, merged_spec in deps.items():
         if merged_spec.spec.is_version_only():
             result.add(name, merged_spec.spec.version)
@@ -231,8 +228,9 @@ def _create_dependencies_table(deps: Mapping[str, MergedSpec]) -> Table | None:
             inline_table = tomlkit.inline_table()
             inline_table.comment(_MANAGED_COMMENT)
             # Do not output values that are empty, it does not mean the same as "*".
-            dict_spec = {k: v for (k, v) in dataclasses.asdict(merged_spec.spec).items() if v}
-            inline_table.update(dict_spec)
+            spec = merged_spec.spec
+            dict_spec = {"version": spec.version, "build": spec.build, "channel": spec.channel}
+            inline_table.update({k: v for (k, v) in dict_spec.items() if v})
             result.add(name, inline_table)
         result[name].comment(f"From: {', '.join(merged_spec.sources)}")
 
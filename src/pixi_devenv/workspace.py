@@ -1,5 +1,5 @@
-import graphlib
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Self, Mapping, Iterator
@@ -27,7 +27,7 @@ class Workspace:
     graph: Mapping[ProjectName, Sequence[ProjectName]]
 
     # Order to iterate from the top upstream all the way to the bottom (the `starting_project`).
-    _upstream_to_downstream_order: Sequence[ProjectName]
+    _upstream_to_downstream_projects: Sequence[Project]
 
     @classmethod
     def from_starting_file(cls, pixi_devenv_file: Path) -> Self:
@@ -35,32 +35,117 @@ class Workspace:
         Creates the workspace based on the pixi.devenv.toml file from the given starting project.
         """
         starting_project = Project.from_file(pixi_devenv_file)
-        to_process = [starting_project]
+        starting_file = pixi_devenv_file.resolve()
+        loaded, upstream_files = _load_projects(starting_file, starting_project)
+
+        to_process = [starting_file]
         projects = dict[ProjectName, Project]()
         graph = dict[ProjectName, list[ProjectName]]()
         while to_process:
-            project = to_process.pop()
+            project_file = to_process.pop()
+            project = loaded[project_file]
             if project.name in projects:
                 continue
             projects[project.name] = project
             graph[project.name] = []
 
-            for upstream in project.iter_upstream():
-                upstream_project = Project.from_file(
-                    project.directory.joinpath(upstream.path, "pixi.devenv.toml")
-                )
-                to_process.append(upstream_project)
-                graph[project.name].append(upstream_project.name)
+            # Upstream files are still pushed when already processed: the processing order defines the order
+            # of the graph, which in turn breaks ties in the topological sort.
+            for upstream_file in upstream_files[project_file]:
+                to_process.append(upstream_file)
+                graph[project.name].append(loaded[upstream_file].name)
 
-        sorter = graphlib.TopologicalSorter(graph)
-        try:
-            upstream_to_downstream_order = list(sorter.static_order())
-        except graphlib.CycleError as e:
-            raise DevEnvError(f"DevEnv dependencies are in a cycle: {e.args[1]}")
-        return cls(starting_project, projects, graph, upstream_to_downstream_order)
+        upstream_to_downstream_projects = tuple(projects[p] for p in _topological_order(graph))
+        # The graph is not changed after this point, tuples are more compact.
+        frozen_graph = {name: tuple(upstreams) for name, upstreams in graph.items()}
+        return cls(starting_project, projects, frozen_graph, upstream_to_downstream_projects)
 
     def iter_downstream(self) -> Iterator[Project]:
-        yield from (self.projects[p] for p in self._upstream_to_downstream_order)
+        yield from self._upstream_to_downstream_projects
 
     def iter_upstream(self) -> Iterator[Project]:
-        yield from (self.projects[p] for p in reversed(self._upstream_to_downstream_order))
+        yield from reversed(self._upstream_to_downstream_projects)
+
+
+def _load_projects(
+    starting_file: Path, starting_project: Project
+) -> tuple[dict[Path, Project], dict[Path, list[Path]]]:
+    """
+    Loads all the projects reachable from the starting project, returning:
+
+    * The projects, by their resolved file name.
+    * The resolved file names of the direct upstream projects of each project, in declaration order.
+
+    Projects are loaded one "layer" at a time, with the files of each layer read and parsed in parallel. The
+    same upstream is often reached through different relative paths (diamond dependencies), but is only
+    loaded once.
+    """
+    loaded = {starting_file: starting_project}
+    upstream_files = dict[Path, list[Path]]()
+    layer = [starting_file]
+    with ThreadPoolExecutor() as executor:
+        while layer:
+            to_load = dict[Path, Path]()
+            for project_file in layer:
+                project = loaded[project_file]
+                upstream_files[project_file] = []
+                for upstream in project.iter_upstream():
+                    upstream_file = project.directory.joinpath(upstream.path, "pixi.devenv.toml")
+                    resolved_file = upstream_file.resolve()
+                    upstream_files[project_file].append(resolved_file)
+                    if resolved_file not in loaded:
+                        to_load.setdefault(resolved_file, upstream_file)
+
+            loaded.update(zip(to_load, executor.map(Project.from_file, to_load.values())))
+            layer = list(to_load)
+    return loaded, upstream_files
+
+
+def _topological_order(graph: Mapping[ProjectName, Sequence[ProjectName]]) -> list[ProjectName]:
+    """
+    Orders the projects in the graph from the top upstream to the bottom downstream (Kahn's algorithm).
+
+    Produces the same order as `graphlib.TopologicalSorter(graph).static_order()`, which the generated
+    configuration depends on, without its per-node bookkeeping objects.
+    """
+    # Number of upstream projects not yet ordered, and direct downstream projects, of each project.
+    # Projects are registered in the same order as graphlib so ties are broken the same way.
+    pending = dict[ProjectName, int]()
+    downstream = dict[ProjectName, list[ProjectName]]()
+    for name, upstreams in graph.items():
+        pending[name] = pending.get(name, 0) + len(upstreams)
+        for upstream in upstreams:
+            pending.setdefault(upstream, 0)
+            downstream.setdefault(upstream, []).append(name)
+
+    order = []
+    ready = [name for name, count in pending.items() if count == 0]
+    while ready:
+        order.extend(ready)
+        next_ready = []
+        for name in ready:
+            for downstream_name in downstream.get(name, ()):
+                pending[downstream_name] -= 1
+                if pending[downstream_name] == 0:
+                    next_ready.append(downstream_name)
+        ready = next_ready
+
+    if len(order) < len(pending):
+        raise DevEnvError(f"DevEnv dependencies are in a cycle: {_find_cycle(graph, pending)}")
+    return order
+
+
+def _find_cycle(
+    graph: Mapping[ProjectName, Sequence[ProjectName]], pending: Mapping[ProjectName, int]
+) -> list[ProjectName]:
+    """
+    Finds a cycle among the projects that could not be ordered (with pending upstream projects), returned
+    from upstream to downstream, with the first project repeated at the end.
+    """
+    name = next(name for name, count in pending.items() if count > 0)
+    path = []
+    while name not in path:
+        path.append(name)
+        name = next(upstream for upstream in graph[name] if pending[upstream] > 0)
+    cycle = path[path.index(name) :] + [name]
+    return cycle[::-1]
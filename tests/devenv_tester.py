@@ -1,5 +1,6 @@
 import pprint
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -7,21 +8,31 @@ from pathlib import Path
 class DevEnvTester:
     projects_path: Path
 
+    # Prefix of the paths inside `projects_path`, replaced by `pprint_for_regression`.
+    _posix_prefix: str = field(init=False, repr=False)
+
+    # Matches everything replaced by `pprint_for_regression`, so the output is scanned only once.
+    _regression_re: re.Pattern[str] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._posix_prefix = self.projects_path.as_posix()
+        self._regression_re = re.compile(rf"{re.escape(self._posix_prefix)}|WindowsPath\(|PosixPath\(")
+
     def write_devenv(self, parent_path: str, contents: str) -> Path:
-        toml = self.projects_path.joinpath(f"{parent_path}/pixi.devenv.toml")
+        toml = self.projects_path / parent_path / "pixi.devenv.toml"
         toml.parent.mkdir(parents=True, exist_ok=True)
-        toml.write_text(contents)
+        toml.write_text(contents, encoding="UTF-8")
         return toml
 
     def write_pixi(self, parent_path: str, contents: str) -> Path:
-        toml = self.projects_path.joinpath(f"{parent_path}/pixi.toml")
+        toml = self.projects_path / parent_path / "pixi.toml"
         toml.parent.mkdir(parents=True, exist_ok=True)
-        toml.write_text(contents)
+        toml.write_text(contents, encoding="UTF-8")
         return toml
 
     def pprint_for_regression(self, obj: object) -> str:
         contents = pprint.pformat(obj, sort_dicts=False)
-        contents = contents.replace(str(self.projects_path.as_posix()), "<TMP_PATH>")
-        contents = contents.replace("WindowsPath(", "Path(")
-        contents = contents.replace("PosixPath(", "Path(")
-        return contents
+        return self._regression_re.sub(self._regression_replacement, contents)
+
+    def _regression_replacement(self, match: re.Match[str]) -> str:
+        return "<TMP_PATH>" if match.group() == self._posix_prefix else "Path("
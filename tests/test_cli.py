@@ -1,10 +1,21 @@
+import pytest
 from typer.testing import CliRunner
 
-from pixi_devenv.cli import app
+from pixi_devenv.cli import app, run
 
 
-def test_version() -> None:
-    runner = CliRunner()
-    result = runner.invoke(app, ["--version"])
+@pytest.fixture(scope="module")
+def cli_runner() -> CliRunner:
+    return CliRunner()
+
+
+def test_version(cli_runner: CliRunner) -> None:
+    result = cli_runner.invoke(app, ["--version"])
     assert result.exit_code == 0
     assert result.output.startswith("pixi-devenv ")
+
+
+def test_version_fast_path(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.setattr("sys.argv", ["pixi-devenv", "--version"])
+    run()
+    assert capsys.readouterr().out.startswith("pixi-devenv ")
@@ -1,7 +1,15 @@
+import re
+
 import pytest
 from pytest_regressions.file_regression import FileRegressionFixture
 
-from pixi_devenv.consolidate import consolidate_devenv, MergedSpec, target_matches_platforms
+from pixi_devenv.consolidate import (
+    consolidate_devenv,
+    MergedSpec,
+    target_matches_platforms,
+    MergedEnvVarValue,
+    ResolvedEnvVar,
+)
 from pixi_devenv.project import ProjectName, Spec
 from pixi_devenv.error import DevEnvError
 from pixi_devenv.workspace import Workspace
@@ -72,7 +80,9 @@ def test_merged_spec() -> None:
     assert m2.add("lib", ProjectName("b"), Spec(">=13.2", build="b1")) == MergedSpec(
         (ProjectName("a"), ProjectName("b")), Spec(">=12.0,>=13.2", build="b1")
     )
-    with pytest.raises(DevEnvError, match="Conflicting builds"):
+    with pytest.raises(
+        DevEnvError, match=re.escape("Conflicting builds declared for lib in ('a',) and b: b1, b99")
+    ):
         _ = m2.add("lib", ProjectName("b"), Spec(">=13.2", build="b99"))
 
     # Merge 'channel'.
@@ -83,10 +93,64 @@ def test_merged_spec() -> None:
     assert m2.add("lib", ProjectName("b"), Spec(">=13.2", channel="ch1")) == MergedSpec(
         (ProjectName("a"), ProjectName("b")), Spec(">=12.0,>=13.2", channel="ch1")
     )
-    with pytest.raises(DevEnvError, match="Conflicting channels"):
+    with pytest.raises(
+        DevEnvError, match=re.escape("Conflicting channels declared for lib in ('a',) and ('b',): ch1, ch99")
+    ):
         _ = m2.add("lib", ProjectName("b"), Spec(">=13.2", channel="ch99"))
 
 
+def test_merged_env_var_value() -> None:
+    a = MergedEnvVarValue((ProjectName("a"),), ResolvedEnvVar("1"))
+    b = MergedEnvVarValue((ProjectName("b"),), ResolvedEnvVar("2"))
+    assert a.merge(b) == MergedEnvVarValue((ProjectName("a"), ProjectName("b")), ResolvedEnvVar("2"))
+
+    a_list = MergedEnvVarValue((ProjectName("a"),), ResolvedEnvVar(("x",)))
+    b_list = MergedEnvVarValue((ProjectName("b"),), ResolvedEnvVar(("y", "z")))
+    assert a_list.merge(b_list) == MergedEnvVarValue(
+        (ProjectName("a"), ProjectName("b")), ResolvedEnvVar(("x", "y", "z"))
+    )
+
+    with pytest.raises(DevEnvError, match="Incompatible env-var definition"):
+        _ = a.merge(b_list)
+    with pytest.raises(DevEnvError, match="Incompatible env-var definition"):
+        _ = a_list.merge(b)
+
+    # The mismatch is reported against the value merged so far.
+    c = MergedEnvVarValue((ProjectName("c"),), ResolvedEnvVar("3"))
+    with pytest.raises(DevEnvError, match=re.escape("same type: ('y', 'z') vs '2'")):
+        _ = MergedEnvVarValue.merge_all([a, b, b_list])
+    with pytest.raises(DevEnvError, match=re.escape("same type: '3' vs ('x', 'y', 'z')")):
+        _ = MergedEnvVarValue.merge_all([a_list, b_list, c])
+
+
+def test_resolved_env_var_placeholders(devenv_tester: DevEnvTester) -> None:
+    devenv_tester.write_devenv("bootstrap", "[devenv]")
+    a_toml = devenv_tester.write_devenv(
+        "a",
+        """
+        devenv.upstream = ["../bootstrap"]
+        """,
+    )
+    ws = Workspace.from_starting_file(a_toml)
+    bootstrap = ws.projects[ProjectName("bootstrap")]
+
+    assert ResolvedEnvVar.resolve(bootstrap, ws, "${{ devenv_project_dir }}/src") == ResolvedEnvVar(
+        "${PIXI_PROJECT_ROOT}/../bootstrap/src"
+    )
+    # Other spellings of the placeholder are still supported.
+    assert ResolvedEnvVar.resolve(bootstrap, ws, ("${{devenv_project_dir}}/src", "lib")) == ResolvedEnvVar(
+        ("${PIXI_PROJECT_ROOT}/../bootstrap/src", "lib")
+    )
+    # Values are rendered by Jinja as a whole, regardless of the placeholder spelling.
+    assert ResolvedEnvVar.resolve(bootstrap, ws, "{% if true %}y{% endif %}") == ResolvedEnvVar("y")
+    assert ResolvedEnvVar.resolve(
+        bootstrap, ws, ("${{ devenv_project_dir }}{# c #}", "${{devenv_project_dir}}{# c #}")
+    ) == ResolvedEnvVar(("${PIXI_PROJECT_ROOT}/../bootstrap", "${PIXI_PROJECT_ROOT}/../bootstrap"))
+    assert ResolvedEnvVar.resolve(bootstrap, ws, "${{ devenv_project_dir }}/src\n") == ResolvedEnvVar(
+        "${PIXI_PROJECT_ROOT}/../bootstrap/src"
+    )
+
+
 def test_dependencies(devenv_tester: DevEnvTester, file_regression: FileRegressionFixture) -> None:
     devenv_tester.write_devenv(
         "bootstrap",
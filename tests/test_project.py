@@ -80,3 +80,9 @@ def test_environment_error(devenv_tester: DevEnvTester) -> None:
     toml = devenv_tester.write_devenv("gui", contents)
     with pytest.raises(DevEnvError):
         Project.from_file(toml)
+
+
+def test_crlf_newlines(devenv_tester: DevEnvTester) -> None:
+    toml = devenv_tester.write_devenv("gui", '[devenv]\r\n[devenv.env-vars]\r\nNOTE = """a\r\nb"""\r\n')
+    project = Project.from_file(toml)
+    assert project.env_vars == {"NOTE": "a\nb"}
@@ -1,6 +1,9 @@
+from pathlib import Path
+
 import pytest
 
 from pixi_devenv.error import DevEnvError
+from pixi_devenv.project import Project
 from pixi_devenv.workspace import Workspace
 from tests.devenv_tester import DevEnvTester
 
@@ -56,13 +59,13 @@ def test_standard(devenv_tester: DevEnvTester) -> None:
         "app",
     }
     assert ws.graph == {
-        "bootstrap": [],
-        "xgui": ["bootstrap"],
-        "pvt": ["bootstrap"],
-        "core": ["pvt"],
-        "calc": ["core", "pvt"],
-        "gui": ["xgui"],
-        "app": ["calc", "gui"],
+        "bootstrap": (),
+        "xgui": ("bootstrap",),
+        "pvt": ("bootstrap",),
+        "core": ("pvt",),
+        "calc": ("core", "pvt"),
+        "gui": ("xgui",),
+        "app": ("calc", "gui"),
     }
     assert [x.name for x in ws.iter_upstream()] == [
         "app",
@@ -116,12 +119,12 @@ def test_two_upstream_branches(devenv_tester: DevEnvTester) -> None:
     ws = Workspace.from_starting_file(app_toml)
     assert set(ws.projects) == {"bootstrap", "bootstrap_2", "a", "b", "c", "app"}
     assert ws.graph == {
-        "bootstrap": [],
-        "bootstrap_2": [],
-        "app": ["a", "b", "c"],
-        "c": ["bootstrap_2"],
-        "b": ["bootstrap"],
-        "a": ["bootstrap"],
+        "bootstrap": (),
+        "bootstrap_2": (),
+        "app": ("a", "b", "c"),
+        "c": ("bootstrap_2",),
+        "b": ("bootstrap",),
+        "a": ("bootstrap",),
     }
     assert [x.name for x in ws.iter_upstream()] == [
         "app",
@@ -152,7 +155,7 @@ def test_single_file(devenv_tester: DevEnvTester) -> None:
 
     ws = Workspace.from_starting_file(app_toml)
     assert set(ws.projects) == {"app"}
-    assert ws.graph == {"app": []}
+    assert ws.graph == {"app": ()}
     assert [x.name for x in ws.iter_upstream()] == ["app"]
     assert [x.name for x in ws.iter_downstream()] == ["app"]
 
@@ -175,3 +178,23 @@ def test_cycle(devenv_tester: DevEnvTester) -> None:
     )
     with pytest.raises(DevEnvError, match="DevEnv dependencies are in a cycle"):
         _ = Workspace.from_starting_file(b_toml)
+
+
+def test_upstream_loaded_once(devenv_tester: DevEnvTester, monkeypatch: pytest.MonkeyPatch) -> None:
+    devenv_tester.write_devenv("bootstrap", "[devenv]")
+    devenv_tester.write_devenv("a", 'devenv.upstream = ["../bootstrap"]')
+    devenv_tester.write_devenv("b", 'devenv.upstream = ["../bootstrap"]')
+    app_toml = devenv_tester.write_devenv("app", 'devenv.upstream = ["../a", "../b"]')
+
+    loaded_files = []
+    original_from_file = Project.from_file
+
+    def from_file(devenv_file: Path) -> Project:
+        loaded_files.append(devenv_file.resolve().parent.name)
+        return original_from_file(devenv_file)
+
+    monkeypatch.setattr(Project, "from_file", from_file)
+
+    ws = Workspace.from_starting_file(app_toml)
+    assert ws.graph == {"app": ("a", "b"), "b": ("bootstrap",), "a": ("bootstrap",), "bootstrap": ()}
+    assert sorted(loaded_files) == ["a", "app", "b", "bootstrap"]